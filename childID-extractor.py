@@ -10,14 +10,17 @@ Last updated: 2025-04-29
 """
 
 import re
+import html as html_lib
 import logging
+import mmap
 import sys
 import csv
 import os
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional, Union
-from bs4 import BeautifulSoup
+from typing import List, Dict, Optional, Tuple, Union
+from lxml import etree, html as lxml_html
 
 # Set up logging
 logging.basicConfig(
@@ -26,48 +29,117 @@ logging.basicConfig(
 )
 logger = logging.getLogger('child_extractor')
 
+# Compiled once at import time - these run for every anchor in every file
+_CHILD_ANCHOR_RE = re.compile(r'<a(?:\s[^>]*?)?\shref\s*=\s*["\']?[^"\'\s>]*/child/', re.IGNORECASE)
+_FAST_CHILD_RE = re.compile(
+    r'<a(?:\s[^>]*?)?\shref="[^"]*?/child/([^/"]+)[^"]*"[^>]*>'
+    r'(?:(?!</a>).)*?'
+    r'<div\s[^>]*?class="(?:[^"]*\s)?col-(?:lg|xs)-8(?:\s[^"]*)?"[^>]*>'
+    r'((?:(?!</?div\b).)*)</div>',
+    re.DOTALL
+)
+# Markup whose contents the tree parser doesn't treat as ordinary elements;
+# the regex path can't tell an anchor in there from a real one
+_NON_ELEMENT_RE = re.compile(
+    r'<(?:!--|!\[CDATA\[|(?:script|style|template|textarea|title|xmp|iframe|noembed|noframes|plaintext)\b)',
+    re.IGNORECASE
+)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WORD_RE = re.compile(r'\w+')
+# Unicode \s already covers non-breaking spaces (\xa0)
+_WS_RE = re.compile(r'\s+')
+_COMMON_JUNK_RE = re.compile(r'overview|profile|details')
+
+_CHILD_LINK_XPATH = etree.XPath('.//a[contains(@href, "/child/")]')
+_NAME_DIV_XPATH = etree.XPath(
+    './/div[contains(concat(" ", normalize-space(@class), " "), " col-lg-8 ")'
+    ' or contains(concat(" ", normalize-space(@class), " "), " col-xs-8 ")]'
+)
+_MODAL_XPATH = etree.XPath(
+    '//*[@id="main-body"]/div[contains(concat(" ", normalize-space(@class), " "), " modal-wrapper ")]'
+)
+
+# Files at least this big are memory-mapped rather than read into a buffer
+_MMAP_THRESHOLD = 1 << 20
+
+# Worker processes only pay for their start-up on batches at least this big
+_PARALLEL_MIN_FILES = 4
+_PARALLEL_MIN_BYTES = 4 << 20
+
 class ChildInfoExtractor:
     """Extract child information from ChildPaths HTML."""
     
     def __init__(self, debug: bool = False):
         self.debug = debug
         self.child_id_pattern = re.compile(r'/child/([^/]+)')
-        self.all_children = []
+        # Columnar storage: one list per field instead of a dict per child
+        self._ids = []
+        self._names = []
+        self._sources = []
+        self._times = []
+        self._seen_ids = set()
+    
+    @property
+    def all_children(self) -> List[Dict[str, str]]:
+        """All extracted children as a list of dicts (built on access)."""
+        return [
+            {'id': i, 'name': n, 'source': s, 'extraction_time': t}
+            for i, n, s, t in zip(self._ids, self._names, self._sources, self._times)
+        ]
+    
+    def __len__(self) -> int:
+        """Number of extracted children, without building the row dicts."""
+        return len(self._ids)
         
     def _sanitize_text(self, text: Optional[str]) -> str:
         """Clean up text - handling whitespace, non-breaking spaces, etc."""
         if not text:
             return ""
-        return ' '.join(text.replace('\xa0', ' ').split())
+        return _WS_RE.sub(' ', text).strip()
     
     def _extract_child_id(self, href: str) -> Optional[str]:
         """Pull the child ID from a URL."""
         if not href:
             return None
+        
+        # Plain slicing handles the standard /child/<id>/... URL without a regex match
+        start = href.find('/child/')
+        if start < 0:
+            return None
+        rest = href[start + 7:]
+        end = rest.find('/')
+        child_id = rest if end < 0 else rest[:end]
+        if child_id:
+            return child_id
             
+        # Non-standard URL (e.g. an empty segment) - let the regex search further along
         match = self.child_id_pattern.search(href)
         return match.group(1) if match else None
     
-    def _find_child_name(self, anchor_tag) -> str:
-        """Extract child name from the anchor tag structure."""
-        # First try the expected structure
-        name_div = anchor_tag.find('div', {'class': ['col-lg-8', 'col-xs-8']})
-        
-        if name_div:
-            return self._sanitize_text(name_div.text)
-            
-        # If that didn't work, try a few common variations
-        alt_name_div = anchor_tag.find('div', text=re.compile(r'\w+'))
-        if alt_name_div:
-            return self._sanitize_text(alt_name_div.text)
+    def _find_child_name_fallback(self, anchor_tag) -> str:
+        """Extract child name from an anchor that lacks the usual name div."""
+        # Try a few common variations
+        for alt_name_div in anchor_tag.iterdescendants('div'):
+            if len(alt_name_div) == 0 and _WORD_RE.search(alt_name_div.text or ''):
+                return self._sanitize_text(alt_name_div.text)
             
         # Last resort: just get all text from the anchor
-        all_text = self._sanitize_text(anchor_tag.text)
+        all_text = self._sanitize_text(anchor_tag.text_content())
         if all_text:
             return all_text
             
         return "Unknown"
     
+    def _read_html(self, file_path: str) -> str:
+        """Read an HTML file as text, decoding large files straight from a memory map."""
+        if os.path.getsize(file_path) >= _MMAP_THRESHOLD:
+            # Decoding from the page cache skips the intermediate bytes copy of a text-mode read
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, 'utf-8')
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    
     def process_file(self, file_path: str) -> List[Dict[str, str]]:
         """
         Read and process HTML from a file
@@ -79,14 +151,37 @@ class ChildInfoExtractor:
             List of extracted child information dictionaries
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-                logger.info(f"Successfully read file: {file_path} ({len(html_content)} bytes)")
-                return self.extract_from_html(html_content, source=os.path.basename(file_path))
+            html_content = self._read_html(file_path)
+            logger.info(f"Successfully read file: {file_path} ({len(html_content)} bytes)")
+            # Interned so every child from this file points at one shared source string
+            return self.extract_from_html(html_content, source=sys.intern(os.path.basename(file_path)))
         except Exception as e:
             logger.error(f"Failed to process file {file_path}: {e}")
             return []
     
+    def process_files(self, file_paths: List[str]) -> List[List[Dict[str, str]]]:
+        """
+        Read and process several HTML files, spreading big batches across processes
+        
+        Args:
+            file_paths: Paths to the HTML files
+            
+        Returns:
+            One list of newly extracted children per input file, in input order
+        """
+        # Each worker reads and parses its own file, so one file's disk read
+        # overlaps with another's parse; de-duplication happens here, in order.
+        # Small batches stay serial - spawning the pool costs more than they take
+        if len(file_paths) >= _PARALLEL_MIN_FILES and _total_size(file_paths) >= _PARALLEL_MIN_BYTES:
+            workers = min(len(file_paths), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(_process_file_worker, file_paths,
+                                           [self.debug] * len(file_paths), chunksize=4))
+        else:
+            parsed = [ChildInfoExtractor(debug=self.debug).process_file(path) for path in file_paths]
+        
+        return [[child for child in file_children if self.add_child(child)] for file_children in parsed]
+    
     def process_directory(self, dir_path: str, extension: str = '.html') -> List[Dict[str, str]]:
         """
         Process all HTML files in a directory
@@ -100,12 +195,14 @@ class ChildInfoExtractor:
         """
         results = []
         try:
-            files = [f for f in os.listdir(dir_path) if f.endswith(extension)]
+            # scandir yields entries with cached type info and ready-made paths
+            with os.scandir(dir_path) as it:
+                entries = [e for e in it if e.name.endswith(extension) and e.is_file()]
+            files = [e.name for e in entries]
+            file_paths = [e.path for e in entries]
             logger.info(f"Found {len(files)} {extension} files in {dir_path}")
             
-            for file in files:
-                file_path = os.path.join(dir_path, file)
-                file_results = self.process_file(file_path)
+            for file, file_results in zip(files, self.process_files(file_paths)):
                 results.extend(file_results)
                 logger.info(f"Extracted {len(file_results)} children from {file}")
             
@@ -114,33 +211,46 @@ class ChildInfoExtractor:
             logger.error(f"Failed to process directory {dir_path}: {e}")
             return []
     
-    def extract_from_html(self, html_content: str, source: str = "unknown") -> List[Dict[str, str]]:
+    def _fast_parse_child_links(self, html_content: str) -> Optional[List[Tuple[str, str]]]:
         """
-        Parse HTML and extract all child information.
+        Pull (id, name) pairs straight out of the raw HTML with a regex.
         
-        Args:
-            html_content: HTML string to parse
-            source: Source identifier for tracking
-            
-        Returns:
-            List of dictionaries with child information
+        Only used when the markup has the usual ChildPaths shape; returns None
+        whenever some child anchor doesn't fit, or the document has comments,
+        scripts or other raw-text content, so the caller can fall back to the
+        full parser.
         """
-        if not html_content:
-            logger.warning("Empty HTML content provided")
-            return []
+        if _NON_ELEMENT_RE.search(html_content):
+            return None
+            
+        anchor_count = len(_CHILD_ANCHOR_RE.findall(html_content))
+        if not anchor_count:
+            return None
             
+        entries = []
+        for match in _FAST_CHILD_RE.finditer(html_content):
+            raw_name = _TAG_RE.sub('', match.group(2))
+            child_name = self._sanitize_text(html_lib.unescape(raw_name))
+            if not child_name:
+                return None
+            entries.append((match.group(1), child_name))
+        
+        return entries if len(entries) == anchor_count else None
+    
+    def _parse_child_links(self, html_content: str) -> Optional[List[Tuple[str, str]]]:
+        """Build the full document tree and pull (id, name) pairs from every child anchor."""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            root = lxml_html.document_fromstring(html_content)
         except Exception as e:
             logger.error(f"Failed to parse HTML: {e}")
-            return []
+            return None
         
-        children = []
-        child_links = soup.find_all('a', href=re.compile(r'/child/'))
+        entries = []
+        child_links = _CHILD_LINK_XPATH(root)
         
         if not child_links and self.debug:
             logger.debug("No child links found - might be using unexpected HTML structure")
-            all_links = soup.find_all('a')
+            all_links = root.iter('a')
             for link in all_links:
                 logger.debug(f"Found link: {link.get('href')}")
         
@@ -153,39 +263,94 @@ class ChildInfoExtractor:
                     logger.warning(f"Could not extract child ID from link: {href}")
                     continue
                 
-                child_name = self._find_child_name(a_tag)
+                # Expected structure first; the fallback chain only runs when it's missing
+                name_divs = _NAME_DIV_XPATH(a_tag)
+                if name_divs:
+                    child_name = self._sanitize_text(name_divs[0].text_content())
+                else:
+                    child_name = self._find_child_name_fallback(a_tag)
                 
                 if not child_name or child_name == "Unknown":
                     logger.warning(f"Could not extract name for child ID: {child_id}")
-                    parent_row = a_tag.find_parent('div', {'class': 'row'})
-                    if parent_row:
-                        all_text = self._sanitize_text(parent_row.text)
-                        for common_text in ["overview", "profile", "details"]:
-                            all_text = all_text.replace(common_text, "")
+                    parent_row = next(
+                        (div for div in a_tag.iterancestors('div') if 'row' in (div.get('class') or '').split()),
+                        None
+                    )
+                    if parent_row is not None:
+                        all_text = self._sanitize_text(parent_row.text_content())
+                        all_text = _COMMON_JUNK_RE.sub('', all_text)
                         if all_text:
                             child_name = all_text
                 
-                child_info = {
-                    'id': child_id,
-                    'name': child_name,
-                    'source': source,
-                    'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
-                # Check if this child is already in our list (avoid duplicates)
-                if not any(c['id'] == child_id for c in self.all_children):
-                    children.append(child_info)
-                    self.all_children.append(child_info)
+                entries.append((child_id, child_name))
                 
             except Exception as e:
                 logger.error(f"Error processing child #{idx+1}: {e}")
                 continue
         
+        return entries
+    
+    def extract_from_html(self, html_content: str, source: str = "unknown") -> List[Dict[str, str]]:
+        """
+        Parse HTML and extract all child information.
+        
+        Args:
+            html_content: HTML string to parse
+            source: Source identifier for tracking
+            
+        Returns:
+            List of dictionaries with child information
+        """
+        if not html_content:
+            logger.warning("Empty HTML content provided")
+            return []
+        
+        if '/child/' not in html_content and not self.debug:
+            # No child links anywhere - skip both the regex scan and the tree build;
+            # debug mode still parses so it can list the links it did find
+            entries = []
+        else:
+            # Try the regex fast path first and only build a tree when the markup is unusual
+            entries = self._fast_parse_child_links(html_content)
+        if entries is None:
+            entries = self._parse_child_links(html_content)
+            if entries is None:
+                return []
+        
+        # One timestamp per extraction run; every record shares the same string
+        extraction_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        children = []
+        for child_id, child_name in entries:
+            # Skip children we already have (avoid duplicates) before building the record
+            if child_id in self._seen_ids:
+                continue
+            
+            child_info = {
+                'id': child_id,
+                'name': child_name,
+                'source': source,
+                'extraction_time': extraction_time
+            }
+            self.add_child(child_info)
+            children.append(child_info)
+        
         if not children:
             logger.warning(f"No children extracted from source: {source}")
             
         return children
     
+    def add_child(self, child_info: Dict[str, str]) -> bool:
+        """Record a child unless its ID has already been seen. Returns True if it was added."""
+        if child_info['id'] in self._seen_ids:
+            return False
+        self._seen_ids.add(child_info['id'])
+        self._ids.append(child_info['id'])
+        self._names.append(child_info['name'])
+        self._sources.append(child_info['source'])
+        self._times.append(child_info['extraction_time'])
+        return True
+    
     def export_to_csv(self, filename: str = None) -> str:
         """
         Export all extracted children to CSV file
@@ -196,7 +361,7 @@ class ChildInfoExtractor:
         Returns:
             Path to the created CSV file
         """
-        if not self.all_children:
+        if not self._ids:
             logger.warning("No children to export")
             return ""
             
@@ -205,15 +370,15 @@ class ChildInfoExtractor:
             filename = f"child_data_{timestamp}.csv"
             
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            # Large write buffer keeps syscalls down on big exports
+            with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
                 fieldnames = ['id', 'name', 'source', 'extraction_time']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.writer(csvfile)
                 
-                writer.writeheader()
-                for child in self.all_children:
-                    writer.writerow(child)
+                writer.writerow(fieldnames)
+                writer.writerows(zip(self._ids, self._names, self._sources, self._times))
                     
-            logger.info(f"Successfully exported {len(self.all_children)} children to {filename}")
+            logger.info(f"Successfully exported {len(self._ids)} children to {filename}")
             return os.path.abspath(filename)
             
         except Exception as e:
@@ -230,26 +395,51 @@ class ChildInfoExtractor:
         Returns:
             Path to the created Excel file
         """
-        if not self.all_children:
+        if not self._ids:
             logger.warning("No children to export")
             return ""
             
+        # Prefer xlsxwriter in constant_memory mode, which streams rows to disk
+        # instead of building the whole workbook; fall back to pandas + openpyxl
         try:
-            # Only import pandas when needed
-            import pandas as pd
+            import xlsxwriter
         except ImportError:
-            logger.error("pandas is required for Excel export. Please install it with: pip install pandas openpyxl")
-            return ""
+            xlsxwriter = None
+            
+        if xlsxwriter is None:
+            try:
+                # Only import pandas when needed
+                import pandas as pd
+            except ImportError:
+                logger.error("pandas is required for Excel export. Please install it with: pip install pandas openpyxl")
+                return ""
             
         if not filename:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"child_data_{timestamp}.xlsx"
             
         try:
-            df = pd.DataFrame(self.all_children)
-            df.to_excel(filename, index=False, engine='openpyxl')
+            fieldnames = ['id', 'name', 'source', 'extraction_time']
+            if xlsxwriter is not None:
+                workbook = xlsxwriter.Workbook(filename, {
+                    'constant_memory': True,
+                    'use_zip64': True,
+                    'strings_to_formulas': False,
+                    'strings_to_urls': False
+                })
+                try:
+                    worksheet = workbook.add_worksheet()
+                    worksheet.write_row(0, 0, fieldnames)
+                    rows = zip(self._ids, self._names, self._sources, self._times)
+                    for row_idx, row in enumerate(rows, 1):
+                        worksheet.write_row(row_idx, 0, row)
+                finally:
+                    workbook.close()
+            else:
+                df = pd.DataFrame(dict(zip(fieldnames, (self._ids, self._names, self._sources, self._times))))
+                df.to_excel(filename, index=False, engine='openpyxl')
             
-            logger.info(f"Successfully exported {len(self.all_children)} children to {filename}")
+            logger.info(f"Successfully exported {len(self._ids)} children to {filename}")
             return os.path.abspath(filename)
             
         except Exception as e:
@@ -257,6 +447,57 @@ class ChildInfoExtractor:
             return ""
 
 
+def _process_file_worker(file_path: str, debug: bool) -> List[Dict[str, str]]:
+    """Parse one file with a fresh extractor; runs in a worker process for process_files."""
+    return ChildInfoExtractor(debug=debug).process_file(file_path)
+
+
+def _total_size(file_paths: List[str]) -> int:
+    """Combined size in bytes of the files that exist; missing ones are left to process_file."""
+    total = 0
+    for path in file_paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            continue
+    return total
+
+
+def _fetch_modal_with_cookies(url: str, driver) -> Optional[str]:
+    """
+    Fetch the switch modal over plain HTTP, reusing the Selenium login cookies.
+    
+    Args:
+        url: Switch modal URL
+        driver: Logged-in Selenium WebDriver whose cookies are copied
+        
+    Returns:
+        Outer HTML of the modal, or None if requests is missing or the page
+        doesn't contain a server-rendered modal (the caller then uses the browser)
+    """
+    try:
+        import requests
+    except ImportError:
+        return None
+        
+    session = requests.Session()
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    session.headers['User-Agent'] = driver.execute_script("return navigator.userAgent;")
+    
+    try:
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+        modals = _MODAL_XPATH(lxml_html.document_fromstring(response.text))
+    except Exception as e:
+        logger.warning(f"Direct fetch of {url} failed, falling back to the browser: {e}")
+        return None
+        
+    if not modals or not _CHILD_LINK_XPATH(modals[0]):
+        return None
+    return etree.tostring(modals[0], encoding='unicode', method='html')
+
+
 def main():
     """Command-line interface for the extractor."""
     parser = argparse.ArgumentParser(
@@ -333,26 +574,30 @@ Examples:
             driver.get('https://app.childpaths.ie/child/index')
             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#child-index-table > tbody tr")))
 
-            # Get first child info
-            first_row = driver.find_element(By.CSS_SELECTOR, "#child-index-table > tbody tr")
-            profile_link_tag = first_row.find_element(By.CSS_SELECTOR, "td:nth-of-type(2) a")
-            first_child_name = profile_link_tag.text.strip()
-            profile_href = profile_link_tag.get_attribute("href")
-            first_child_id = profile_href.split("/child/")[1].split("/")[0]
+            # Grab every profile link on the index page in one round trip
+            # instead of one WebDriver call per element
+            index_html = driver.execute_script(
+                "return Array.from(document.querySelectorAll("
+                "'#child-index-table > tbody tr td:nth-of-type(2) a'"
+                ")).map(a => a.outerHTML).join('');"
+            )
 
             extractor = ChildInfoExtractor(debug=args.verbose)
-            extractor.all_children.append({
-                'id': first_child_id,
-                'name': first_child_name,
-                'source': 'child-index',
-                'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            })
-
-            # Switch modal
-            driver.get(f"https://app.childpaths.ie/child/{first_child_id}/switch")
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#main-body > div.modal-wrapper")))
-            modal = driver.find_element(By.CSS_SELECTOR, "#main-body > div.modal-wrapper")
-            html_content = modal.get_attribute("outerHTML")
+            index_children = extractor.extract_from_html(index_html, source='child-index')
+            if not index_children:
+                print("Error: no children found on the child index page")
+                return
+            first_child_id = index_children[0]['id']
+
+            # Switch modal - try a plain HTTP GET with the browser's session cookies first
+            switch_url = f"https://app.childpaths.ie/child/{first_child_id}/switch"
+            html_content = _fetch_modal_with_cookies(switch_url, driver)
+
+            if html_content is None:
+                driver.get(switch_url)
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#main-body > div.modal-wrapper")))
+                modal = driver.find_element(By.CSS_SELECTOR, "#main-body > div.modal-wrapper")
+                html_content = modal.get_attribute("outerHTML")
 
             # Parse modal
             children = extractor.extract_from_html(html_content, source='live_session')
@@ -364,7 +609,7 @@ Examples:
                 filepath = extractor.export_to_csv(args.output)
 
             if filepath:
-                print(f"\n✅ Exported {len(extractor.all_children)} children to: {filepath}")
+                print(f"\n✅ Exported {len(extractor)} children to: {filepath}")
             else:
                 print("\n❌ Failed to export data.")
 
@@ -379,13 +624,15 @@ Examples:
     
     # Process input sources
     if args.files:
+        file_paths = []
         for file_path in args.files:
             if not os.path.exists(file_path):
                 logger.error(f"File not found: {file_path}")
                 continue
-                
-            print(f"\nProcessing file: {file_path}")
-            children = extractor.process_file(file_path)
+            file_paths.append(file_path)
+        
+        for file_path, children in zip(file_paths, extractor.process_files(file_paths)):
+            print(f"\nProcessed file: {file_path}")
             print(f"Extracted {len(children)} children from this file")
     
     elif args.directory:
@@ -398,7 +645,7 @@ Examples:
         print(f"Extracted {len(children)} children from all files")
     
     # Output results
-    if not extractor.all_children:
+    if len(extractor) == 0:
         print("\nNo children were extracted. Please check your input files.")
         return
     
@@ -416,7 +663,7 @@ Examples:
         filepath = extractor.export_to_csv(output_filename)
     
     if filepath:
-        print(f"\nSuccessfully exported {len(extractor.all_children)} children to: {filepath}")
+        print(f"\nSuccessfully exported {len(extractor)} children to: {filepath}")
     else:
         print("\nFailed to export data. Check log for details.")
 
@@ -460,7 +707,7 @@ def run_interactive_mode(extractor):
             print(f"Extracted {len(children)} children from all files")
             
         elif choice == '3':
-            if not extractor.all_children:
+            if len(extractor) == 0:
                 print("No children to export. Please process some files first.")
                 continue
                 
@@ -488,15 +735,18 @@ def run_interactive_mode(extractor):
                 print("Invalid format. Please choose 'csv' or 'excel'.")
             
         elif choice == '4':
-            if not extractor.all_children:
+            if len(extractor) == 0:
                 print("No children have been extracted yet.")
                 continue
+            
+            # Build the row dicts once for the summary below
+            children = extractor.all_children
                 
-            print(f"\nExtracted {len(extractor.all_children)} children in total:")
+            print(f"\nExtracted {len(children)} children in total:")
             
             # Group by source
             sources = {}
-            for child in extractor.all_children:
+            for child in children:
                 source = child.get('source', 'unknown')
                 sources[source] = sources.get(source, 0) + 1
                 
@@ -506,15 +756,15 @@ def run_interactive_mode(extractor):
                 
             # Show sample of data
             print("\nSample data (first 5 entries):")
-            for i, child in enumerate(extractor.all_children[:5]):
+            for i, child in enumerate(children[:5]):
                 print(f"  {i+1}. {child['name']} (ID: {child['id']})")
                 
-            if len(extractor.all_children) > 5:
-                print(f"  ... and {len(extractor.all_children)-5} more")
+            if len(children) > 5:
+                print(f"  ... and {len(children)-5} more")
             
         elif choice == '5':
             # Ask if they want to save before quitting if they have data
-            if extractor.all_children:
+            if len(extractor) > 0:
                 save_action = input("Save data before quitting? (yes/no): ").strip().lower()
                 if save_action in ('yes', 'y'):
                     export_format = input("Export as CSV or Excel? (csv/excel): ").strip().lower()
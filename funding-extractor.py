@@ -10,13 +10,22 @@ Usage:
 
 import argparse
 import sys
+import numpy as np
 import pandas as pd
 import re
 import os
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple, Set
-from collections import Counter
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+
+# Patterns used in the per-name and per-allocation hot paths, compiled once
+_FATHER_RE = re.compile(r'(?i)\bfather\b')
+_NONALNUM_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_WS_RE = re.compile(r'\s+')
+_HOURS_RATE_RE = re.compile(r'(\d+\.\d+|\d+) hours x €(\d+\.\d+|\d+)')
 
 
 # ANSI color codes for terminal output
@@ -63,6 +72,7 @@ def print_progress(current, total, message="Processing", length=40):
         print()
 
 
+@lru_cache(maxsize=None)
 def clean_name(name: str) -> str:
     """
     Clean a name by removing "father", dashes, and keeping only alphanumeric characters and spaces.
@@ -76,25 +86,28 @@ def clean_name(name: str) -> str:
     --------
     str
         Cleaned name
+        
+    Results are cached, since the same names are cleaned repeatedly across passes.
     """
     if not name or not isinstance(name, str):
         return ""
     
     # Remove "father" (case-insensitive)
-    name = re.sub(r'(?i)\bfather\b', '', name)
+    name = _FATHER_RE.sub('', name)
     
     # Remove dashes
     name = name.replace('-', ' ')
     
     # Keep only alphanumeric characters and spaces
-    name = re.sub(r'[^a-zA-Z0-9\s]', '', name)
+    name = _NONALNUM_RE.sub('', name)
     
     # Remove extra spaces
-    name = ' '.join(name.split())
+    name = _WS_RE.sub(' ', name).strip()
     
     return name
 
 
+@lru_cache(maxsize=None)
 def normalize_name(name: str) -> str:
     """
     Normalize a name for case-insensitive comparison.
@@ -108,6 +121,8 @@ def normalize_name(name: str) -> str:
     --------
     str
         Normalized name (lowercase, no extra spaces)
+        
+    Results are cached, since system names are normalized again for every lookup.
     """
     if not name or not isinstance(name, str):
         return ""
@@ -131,13 +146,37 @@ def extract_hours_and_rate(description: str) -> Tuple[Optional[float], Optional[
     if not description or not isinstance(description, str):
         return None, None
         
-    match = re.search(r'(\d+\.\d+|\d+) hours x €(\d+\.\d+|\d+)', description)
+    match = _HOURS_RATE_RE.search(description)
     if match:
         return float(match.group(1)), float(match.group(2))
     return None, None
 
 
-def find_potential_matches(name: str, system_names: List[str], max_matches: int = 5) -> List[Tuple[str, int]]:
+def build_name_index(system_names: List[str]) -> Tuple[List[str], Dict[str, List[int]]]:
+    """
+    Build an inverted word index over the system names so matching only touches candidates.
+    
+    Parameters:
+    -----------
+    system_names : List[str]
+        List of names in the main system
+        
+    Returns:
+    --------
+    Tuple[List[str], Dict[str, List[int]]]
+        The indexed system names, and a mapping from each normalized word to the
+        positions (in that list) of the names containing it
+    """
+    names = [system_name for system_name in system_names if isinstance(system_name, str)]
+    postings = defaultdict(list)
+    for position, system_name in enumerate(names):
+        for word in set(normalize_name(system_name).split()):
+            postings[word].append(position)
+    return names, dict(postings)
+
+
+def find_potential_matches(name: str, system_names: List[str], max_matches: int = 5,
+                           name_index: Optional[Tuple[List[str], Dict[str, List[int]]]] = None) -> List[Tuple[str, int]]:
     """
     Find potential matches for a name in the system based on word overlap.
     
@@ -149,35 +188,40 @@ def find_potential_matches(name: str, system_names: List[str], max_matches: int
         List of names in the main system
     max_matches : int
         Maximum number of matches to return (default 5, but will return up to 15 when single-word matches)
+    name_index : Optional[Tuple[List[str], Dict[str, List[int]]]]
+        Inverted word index from build_name_index; built on the fly if not given
         
     Returns:
     --------
     List[Tuple[str, int]]
-        List of (name, matching_word_count) tuples, sorted by match count descending
+        List of (name, matching_word_count) tuples, sorted by match count descending;
+        only the names with exactly the same words when any exist
     """
     if not name or not isinstance(name, str):
         return []
+    
+    if name_index is None:
+        name_index = build_name_index(system_names)
+    names, postings = name_index
         
     # Split name into words and convert to lowercase
     normalized_name = normalize_name(name)
     name_words = set(normalized_name.split())
     
-    # Calculate word overlap for each system name
-    matches = []
-    for system_name in system_names:
-        if not isinstance(system_name, str):
-            continue
-            
-        normalized_system_name = normalize_name(system_name)
-        system_words = set(normalized_system_name.split())
-        common_words = name_words.intersection(system_words)
-        
-        # Only consider if there's at least one matching word
-        if common_words:
-            matches.append((system_name, len(common_words)))
+    # Count matching words per system name, visiting only names that share a word
+    overlap = Counter()
+    for word in name_words:
+        overlap.update(postings.get(word, ()))
     
-    # Sort by number of matching words (descending)
-    matches.sort(key=lambda x: x[1], reverse=True)
+    # Names made of exactly the same words (e.g. first/last name swapped) can't be beaten; skip ranking
+    word_count = len(name_words)
+    exact = [position for position, count in overlap.items()
+             if count == word_count and len(set(normalize_name(names[position]).split())) == word_count]
+    if exact:
+        return [(names[position], word_count) for position in sorted(exact)]
+    
+    # Sort by number of matching words (descending), keeping system order on ties
+    matches = [(names[position], count) for position, count in sorted(overlap.items(), key=lambda x: (-x[1], x[0]))]
     
     # If the best match only has 1 matching word, return more options (up to 15)
     if matches and matches[0][1] == 1:
@@ -186,7 +230,8 @@ def find_potential_matches(name: str, system_names: List[str], max_matches: int
     return matches[:max_matches]  # Otherwise return the default number
 
 
-def interactive_matching(unmatched_children: List[Dict], system_names: List[str]) -> Dict[str, str]:
+def interactive_matching(unmatched_children: List[Dict], system_names: List[str],
+                         name_index: Optional[Tuple[List[str], Dict[str, List[int]]]] = None) -> Dict[str, str]:
     """
     Interactive terminal process for matching unmatched children.
     
@@ -196,6 +241,8 @@ def interactive_matching(unmatched_children: List[Dict], system_names: List[str]
         List of dictionaries with child information
     system_names : List[str]
         List of names in the main system
+    name_index : Optional[Tuple[List[str], Dict[str, List[int]]]]
+        Inverted word index from build_name_index; built once here if not given
         
     Returns:
     --------
@@ -206,6 +253,9 @@ def interactive_matching(unmatched_children: List[Dict], system_names: List[str]
     total = len(unmatched_children)
     processed = 0
     
+    if name_index is None:
+        name_index = build_name_index(system_names)
+    
     clear_screen()
     print_header("INTERACTIVE NAME MATCHING")
     print_status(f"Found {total} children that need matching", "info")
@@ -234,7 +284,7 @@ def interactive_matching(unmatched_children: List[Dict], system_names: List[str]
             print(f"CHICK: {chick}")
         
         # Get potential matches - potentially more if only single-word matches
-        potential_matches = find_potential_matches(child_name, system_names)
+        potential_matches = find_potential_matches(child_name, system_names, name_index=name_index)
         
         # Display possible matches in the requested format
         print("\nPossible Matches")
@@ -281,6 +331,30 @@ def interactive_matching(unmatched_children: List[Dict], system_names: List[str]
     return matches
 
 
+def read_excel_columns(file_path: str, keywords: Tuple[str, ...]) -> pd.DataFrame:
+    """
+    Read only the columns whose header contains one of the keywords, preferring the calamine engine.
+    
+    Parameters:
+    -----------
+    file_path : str
+        Path to the Excel file
+    keywords : Tuple[str, ...]
+        Substrings identifying the columns to keep
+        
+    Returns:
+    --------
+    pd.DataFrame
+        DataFrame with the matching columns, in file order
+    """
+    usecols = lambda col: isinstance(col, str) and any(keyword in col for keyword in keywords)
+    try:
+        # Rust-backed reader; needs python-calamine and pandas >= 2.2
+        return pd.read_excel(file_path, usecols=usecols, engine='calamine')
+    except (ImportError, ValueError):
+        return pd.read_excel(file_path, usecols=usecols)
+
+
 def extract_funding_data(children_file: str, funding_file: str, system_file: str, 
                          interactive: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
@@ -307,10 +381,10 @@ def extract_funding_data(children_file: str, funding_file: str, system_file: str
     print_status(f"Reading Excel files...", "info")
     
     try:
-        # Read Excel files
-        children_df = pd.read_excel(children_file)
-        funding_df = pd.read_excel(funding_file)
-        system_df = pd.read_excel(system_file)
+        # Read Excel files, materializing only the columns identified below
+        children_df = read_excel_columns(children_file, ('Child', 'Birth', 'CHICK', 'Claim Until'))
+        funding_df = read_excel_columns(funding_file, ('Child', 'Description', 'Date'))
+        system_df = read_excel_columns(system_file, ('name',))
         
         print_status(f"Successfully read: {os.path.basename(children_file)}", "success")
         print_status(f"Successfully read: {os.path.basename(funding_file)}", "success")
@@ -344,141 +418,146 @@ def extract_funding_data(children_file: str, funding_file: str, system_file: str
     print_status("Columns identified successfully", "success")
     
     # Get list of system names for matching
-    system_names = system_df[system_name_col].dropna().tolist()
+    system_series = system_df[system_name_col].dropna()
+    system_names = system_series.tolist()
+    
+    # Columnar string storage for the vectorized normalization; Arrow-backed when pyarrow is installed
+    try:
+        system_strings = system_series.astype('string[pyarrow]')
+    except ImportError:
+        system_strings = system_series.astype('string')
     
-    # Create dictionary of normalized system names for case-insensitive matching
-    normalized_system_names = {normalize_name(name): name for name in system_names}
+    # Set of normalized system names (normalized the same way as the child names) for membership tests
+    normalized_system_names = frozenset(system_strings.str.lower().str.split().str.join(' '))
     
-    # Create empty lists to store result rows
-    result_rows = []
+    # Index system names by word once for the potential-match search
+    name_index = build_name_index(system_names)
+    
+    # Create empty lists to store result columns and unmatched rows
+    result_children, result_originals, result_dobs, result_chicks, result_claims = [], [], [], [], []
+    result_starts, result_weekly_totals, result_rates, result_in_system = [], [], [], []
     unmatched_rows = []
     
     # Get current date for filtering allocations
     current_date = datetime.now().date()
     
+    # Convert allocation dates once for the whole funding table rather than per child
+    date_converted = pd.to_datetime(funding_df[alloc_date_col], errors='coerce', dayfirst=True)
+    
+    # Retry only the rows the first pass couldn't parse against other common formats
+    for fmt in ['%d/%m/%Y', '%Y-%m-%d', '%m/%d/%Y', '%d-%m-%Y']:
+        unparsed = date_converted.isna() & funding_df[alloc_date_col].notna()
+        if not unparsed.any():
+            break
+        try:
+            date_converted[unparsed] = pd.to_datetime(funding_df.loc[unparsed, alloc_date_col], format=fmt, errors='coerce')
+        except (ValueError, TypeError):
+            continue
+    funding_df['date_converted'] = date_converted
+    
+    # Flag current or future allocations (on or after today) in one comparison
+    funding_df['_future'] = funding_df['date_converted'] >= pd.Timestamp(current_date)
+    
+    # Parse hours and rate out of every allocation description in one vectorized pass
+    hours_rate = funding_df[alloc_desc_col].astype('string').str.extract(_HOURS_RATE_RE)
+    funding_df['_hours'] = pd.to_numeric(hours_rate[0], errors='coerce')
+    funding_df['_rate'] = pd.to_numeric(hours_rate[1], errors='coerce')
+    
+    # Aggregate every child's allocations up front instead of slicing the funding table per child
+    funded_children = frozenset(funding_df[funding_child_col].dropna())
+    
+    # Only rows with valid dates take part
+    dated_funding = funding_df.dropna(subset=['date_converted'])
+    dated_by_child = dated_funding.groupby(funding_child_col, sort=False)
+    min_dates = dated_by_child['date_converted'].min().to_dict()
+    has_future = dated_by_child['_future'].any().to_dict()
+    
+    # Current or future allocations, or all of a child's allocations when it has none (as fallback)
+    in_scope = dated_funding['_future'] | ~dated_funding[funding_child_col].map(has_future).fillna(False).astype(bool)
+    scoped_funding = dated_funding[in_scope]
+    
+    # Distinct whole-hour values per child, joined in ascending order (e.g., "21/30")
+    child_hours = scoped_funding[[funding_child_col, '_hours']].dropna(subset=['_hours'])
+    child_hours = child_hours.assign(_hours=child_hours['_hours'].astype(np.int64)).drop_duplicates().sort_values('_hours')
+    weekly_totals = child_hours['_hours'].astype(str).groupby(child_hours[funding_child_col], sort=False).agg('/'.join).to_dict()
+    
+    # Rate of each child's most recent allocation that has one
+    rated_funding = scoped_funding.dropna(subset=['_rate'])
+    latest_idx = rated_funding.groupby(funding_child_col, sort=False)['date_converted'].idxmax()
+    latest_rates = dict(zip(latest_idx.index, rated_funding.loc[latest_idx.to_numpy(), '_rate']))
+    
     # Process each child
     total_children = len(children_df)
     print_header(f"PROCESSING {total_children} CHILDREN")
-    
-    for idx, (_, child_row) in enumerate(children_df.iterrows()):
-        child_name = child_row[child_col]
-        dob = child_row.get(dob_col, None) if dob_col else None
-        chick = child_row.get(chick_col, None) if chick_col else None
-        claim_until = child_row.get(claim_until_col, None) if claim_until_col else None
+    progress_step = max(1, total_children // 100)
+    
+    # Parse every claim-until date as a scalar parse would (element-wise), skipping blank cells
+    if claim_until_col:
+        claims = children_df[claim_until_col].astype(object)
+        claim_until_dates = pd.to_datetime(claims.where(claims.astype(bool)), errors='coerce', format='mixed')
+    else:
+        claim_until_dates = pd.Series(pd.NaT, index=children_df.index, dtype='datetime64[ns]')
+    
+    # Calculate CHICK starts (expiry - 363 days, then round to Monday) for all children at once
+    chick_starts = claim_until_dates - pd.Timedelta(days=363)
+    chick_starts -= pd.to_timedelta(chick_starts.dt.weekday, unit='D')
+    
+    # Earliest valid allocation per child (NaT when there is none) and the resulting start date:
+    # the earliest allocation when it falls inside the CHICK, otherwise the CHICK start
+    child_min_dates = pd.to_datetime(children_df[child_col].map(min_dates))
+    has_both = child_min_dates.notna() & claim_until_dates.notna()
+    after_expiry = has_both & (child_min_dates > claim_until_dates)
+    within_chick = has_both & (child_min_dates >= chick_starts) & (child_min_dates <= claim_until_dates)
+    start_dates = child_min_dates.where(within_chick, chick_starts).where(has_both & ~after_expiry)
+    
+    # Format all start dates at once
+    start_date_strs = start_dates.dt.strftime("%d/%m/%Y").fillna("").where(~after_expiry, "ERROR: allocation after expiry")
+    
+    # Plain tuples of just the columns we need; optional columns that weren't found read as None
+    child_rows = pd.DataFrame({
+        '_child': children_df[child_col],
+        '_dob': children_df[dob_col] if dob_col else None,
+        '_chick': children_df[chick_col] if chick_col else None,
+        '_claim': children_df[claim_until_col] if claim_until_col else None,
+        '_start': start_date_strs,
+        # Normalize every child name (as normalize_name does) and test system membership at once
+        '_in_system': (children_df[child_col].astype('string').str.lower().str.split().str.join(' ')
+                       .fillna('').isin(normalized_system_names)),
+    }, index=children_df.index)
+    
+    for idx, (child_name, dob, chick, claim_until, start_date_str, in_system) in enumerate(child_rows.itertuples(index=False, name=None)):
         
         # Clean the child name
         cleaned_name = clean_name(child_name)
         
-        print_progress(idx + 1, total_children, f"Processing {cleaned_name}")
-        
-        # Get all funding entries for this child
-        child_funding = funding_df[funding_df[funding_child_col] == child_name]
+        # Redraw the bar only on whole-percent steps (and the last child)
+        if idx % progress_step == 0 or idx + 1 == total_children:
+            print_progress(idx + 1, total_children, f"Processing {cleaned_name}")
         
         # Initialize values
-        start_date = None
-        hour_values = set()
+        weekly_total = ""
         latest_rate = None
         
-        if len(child_funding) > 0:
-            # Make a copy to avoid modifying the original DataFrame
-            child_funding = child_funding.copy()
-            
-            # Convert dates column to datetime safely
-            try:
-                # First try to convert using default format
-                date_col = pd.to_datetime(child_funding[alloc_date_col], errors='coerce', dayfirst=True)
-                
-                # If that fails, try different common formats
-                if date_col.isna().all():
-                    for fmt in ['%d/%m/%Y', '%Y-%m-%d', '%m/%d/%Y', '%d-%m-%Y']:
-                        try:
-                            date_col = pd.to_datetime(child_funding[alloc_date_col], format=fmt, errors='coerce', dayfirst=True)
-                            if not date_col.isna().all():
-                                break
-                        except:
-                            continue
-                
-                child_funding['date_converted'] = date_col
-                
-                # Only keep rows with valid dates
-                child_funding = child_funding.dropna(subset=['date_converted'])
-                
-                if len(child_funding) == 0:
-                    print_status(f"No valid dates found for {child_name}", "warning")
-                    continue
-                    
-            except Exception as e:
-                print_status(f"Error converting dates for {child_name}: {e}", "error")
+        if child_name in funded_children:
+            # No earliest allocation date means no valid dates at all
+            if child_name not in min_dates:
+                print_status(f"No valid dates found for {child_name}", "warning")
                 continue
             
-            # Find start date (earliest allocation date minus 6 days)
-            min_date = child_funding['date_converted'].min()
-            claim_until_date = pd.to_datetime(claim_until, errors='coerce') if claim_until else None
-
-            if not pd.isna(min_date) and not pd.isna(claim_until_date):
-                # Calculate CHICK start (expiry - 363 days, then round to Monday)
-                chick_start = claim_until_date - timedelta(days=363)
-                chick_start -= timedelta(days=chick_start.weekday())
-
-                if min_date > claim_until_date:
-                    start_date = "ERROR: allocation after expiry"
-                elif chick_start <= min_date <= claim_until_date:
-                    start_date = min_date.date()
-                else:
-                    start_date = chick_start.date()
-            else:
-                start_date = None  # or handle/log missing dates
-            
-            # Filter allocations to only include current or future ones
-            # Safely compare dates - convert datetime to date objects first
-            try:
-                current_or_future_funding = child_funding[
-                    child_funding['date_converted'].dt.date >= current_date
-                ]
-            except:
-                # If the dt.date approach fails, try an alternative method
-                current_or_future_funding = child_funding[
-                    child_funding['date_converted'] >= pd.Timestamp(current_date)
-                ]
-            
-            # If no current/future funding, use all funding (as fallback)
-            if len(current_or_future_funding) == 0:
+            # Hours and rate were aggregated over all funding when there's no current/future funding
+            if not has_future[child_name]:
                 print_status(f"No current/future funding found for {child_name}, using all funding", "warning")
-                current_or_future_funding = child_funding
-            
-            # Collect all distinct hour values from current or future funding
-            for _, fund_row in current_or_future_funding.iterrows():
-                desc = fund_row.get(alloc_desc_col, '')
-                hours, rate = extract_hours_and_rate(desc)
-                
-                if hours is not None:
-                    hour_values.add(hours)
-                if rate is not None:
-                    latest_rate = rate
             
-            # Get most recent rate by sorting by date
-            latest_entries = current_or_future_funding.sort_values(by='date_converted', ascending=False)
-            for _, fund_row in latest_entries.iterrows():
-                desc = fund_row.get(alloc_desc_col, '')
-                _, rate = extract_hours_and_rate(desc)
-                if rate is not None:
-                    latest_rate = rate
-                    break
-        
-        # Format the weekly total as a sorted string (e.g., "21/30")
-        weekly_total = "/".join(map(str, sorted(int(h) for h in hour_values))) if hour_values else ""
-        
-        # Format the start date
-        start_date_str = start_date.strftime("%d/%m/%Y") if start_date else ""
+            weekly_total = weekly_totals.get(child_name, "")
+            latest_rate = latest_rates.get(child_name)
         
         # Check if child is in the main system (case-insensitive)
-        normalized_child_name = normalize_name(child_name)
-        system_match = "Yes" if normalized_child_name in normalized_system_names else "No"
+        system_match = "Yes" if in_system else "No"
         
         # If not matched directly, find potential matches
         potential_matches = []
         if system_match == "No":
-            match_results = find_potential_matches(child_name, system_names)
+            match_results = find_potential_matches(child_name, system_names, name_index=name_index)
             potential_matches = [name for name, _ in match_results]
             
             # Store just the first 5 matches in the unmatched list
@@ -495,20 +574,29 @@ def extract_funding_data(children_file: str, funding_file: str, system_file: str
             })
         
         # Add row for this child
-        result_rows.append({
-            'Child': cleaned_name,  # Use cleaned name in output
-            'Original Child Name': child_name,  # Keep original for reference
-            'Date of Birth': dob,
-            'CHICK': chick,
-            'Claim Until': claim_until,
-            'Start date': start_date_str,
-            'Weekly Total': weekly_total,
-            'Hour rate': f"€{latest_rate:.2f}" if latest_rate is not None else "",
-            'In System': system_match
-        })
-    
-    # Create DataFrames from result rows
-    result_df = pd.DataFrame(result_rows)
+        result_children.append(cleaned_name)  # Use cleaned name in output
+        result_originals.append(child_name)  # Keep original for reference
+        result_dobs.append(dob)
+        result_chicks.append(chick)
+        result_claims.append(claim_until)
+        result_starts.append(start_date_str)
+        result_weekly_totals.append(weekly_total)
+        result_rates.append(f"€{latest_rate:.2f}" if latest_rate is not None else "")
+        result_in_system.append(system_match)
+    
+    # Create DataFrames from the collected columns
+    result_df = pd.DataFrame({
+        'Child': result_children,
+        'Original Child Name': result_originals,
+        'Date of Birth': result_dobs,
+        'CHICK': result_chicks,
+        'Claim Until': result_claims,
+        'Start date': result_starts,
+        'Weekly Total': result_weekly_totals,
+        'Hour rate': result_rates,
+        'In System': pd.Categorical(result_in_system, categories=['Yes', 'No', 'Manual Match']),
+        'Matched Name': "",  # Filled in by interactive matching
+    }, copy=False)
     unmatched_df = pd.DataFrame(unmatched_rows)
     
     # Interactive matching if enabled
@@ -518,21 +606,19 @@ def extract_funding_data(children_file: str, funding_file: str, system_file: str
         time.sleep(1)  # Short pause for user to read the message
         
         unmatched_list = unmatched_df.to_dict('records')
-        matches = interactive_matching(unmatched_list, system_names)
+        matches = interactive_matching(unmatched_list, system_names, name_index)
         
-        # Update result DataFrame with manual matches
-        for original, matched in matches.items():
-            mask = result_df['Original Child Name'] == original
+        # Update result DataFrame with all manual matches in one lookup pass
+        if matches:
+            matched_names = result_df['Original Child Name'].map(matches)
+            mask = matched_names.notna()
             result_df.loc[mask, 'In System'] = 'Manual Match'
             
             # Use the matched name (cleaned) instead of the original name
-            cleaned_matched_name = clean_name(matched)
-            result_df.loc[mask, 'Child'] = cleaned_matched_name
+            result_df.loc[mask, 'Child'] = matched_names[mask].map(clean_name)
             
             # Store the matched name for reference
-            if 'Matched Name' not in result_df.columns:
-                result_df['Matched Name'] = ""
-            result_df.loc[mask, 'Matched Name'] = matched
+            result_df.loc[mask, 'Matched Name'] = matched_names[mask]
     
     return result_df, unmatched_df
 
@@ -620,8 +706,8 @@ def main():
         print_status(f"Children found in system: {(result_df['In System'] == 'Yes').sum()}", "success")
         print_status(f"Children not found in system: {(result_df['In System'] == 'No').sum()}", "warning")
         
-        if 'Matched Name' in result_df.columns:
-            manual_matches = (result_df['In System'] == 'Manual Match').sum()
+        manual_matches = (result_df['In System'] == 'Manual Match').sum()
+        if manual_matches:
             print_status(f"Children manually matched: {manual_matches}", "info")
         
         # Create output directory if it doesn't exist
@@ -630,7 +716,11 @@ def main():
         # Create basic child information file (File 1)
         basic_info_df = result_df[['Child', 'CHICK', 'Date of Birth', 'Claim Until']].copy()
         basic_output_path = os.path.join(args.output_dir, "toChildPathsUploader.xlsx")
-        basic_info_df.to_excel(basic_output_path, index=False)
+        try:
+            # xlsxwriter is a much faster writer than openpyxl; fall back when not installed
+            basic_info_df.to_excel(basic_output_path, index=False, engine='xlsxwriter')
+        except ImportError:
+            basic_info_df.to_excel(basic_output_path, index=False)
         print_status(f"Basic child information saved to {basic_output_path}", "success")
         
         # Create complete funding information file (File 2)
@@ -12,15 +12,25 @@ Merged Script:
 """
 
 import argparse
+import csv
 import sys
+import numpy as np
 import pandas as pd
 import re
 import os
 import time
-from datetime import datetime, timedelta
+import heapq
+from collections import Counter, defaultdict
+from datetime import date, timedelta
 from typing import List, Dict, Tuple, Optional
 
 
+# Patterns used in the per-name and per-allocation paths, compiled once
+_FATHER_RE = re.compile(r'\bfather\b', re.IGNORECASE)
+_NONALNUM_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_HOURS_RATE_RE = re.compile(r'(\d+\.\d+|\d+) hours x €(\d+\.\d+|\d+)')
+
+
 class Colors:
     HEADER = '\033[95m'
     BLUE = '\033[94m'
@@ -49,36 +59,63 @@ def normalize_name(name: str) -> str:
 def clean_name(name: str) -> str:
     if not isinstance(name, str):
         return ""
-    name = re.sub(r'(?i)\\bfather\\b', '', name)
+    name = _FATHER_RE.sub('', name)
     name = name.replace('-', ' ')
-    name = re.sub(r'[^a-zA-Z0-9\s]', '', name)
+    name = _NONALNUM_RE.sub('', name)
     return ' '.join(name.split())
 
+def csv_cell(value) -> object:
+    # Fixed cell text for the streamed CSVs: missing values blank, date values as YYYY-MM-DD,
+    # everything else left for csv to str()
+    if not isinstance(value, str) and pd.isna(value):
+        return ""
+    if isinstance(value, (date, np.datetime64)):
+        return pd.Timestamp(value).strftime("%Y-%m-%d")
+    return value
+
+def read_excel(path: str, **kwargs) -> pd.DataFrame:
+    # Rust-backed calamine reader when python-calamine is installed; pandas' read-only openpyxl otherwise
+    try:
+        return pd.read_excel(path, engine='calamine', **kwargs)
+    except (ImportError, ValueError):
+        return pd.read_excel(path, **kwargs)
+
 def extract_hours_and_rate(description: str) -> Tuple[Optional[float], Optional[float]]:
-    match = re.search(r'(\d+\.\d+|\d+) hours x €(\d+\.\d+|\d+)', str(description))
+    match = _HOURS_RATE_RE.search(str(description))
     if match:
         return float(match.group(1)), float(match.group(2))
     return None, None
 
-def find_potential_matches(name: str, system_names: List[str], max_matches: int = 5) -> List[Tuple[str, int]]:
+def build_token_index(system_names: List[str]) -> Dict[str, List[int]]:
+    # Normalized token -> positions of the system names that contain it
+    token_index = defaultdict(list)
+    for position, sys_name in enumerate(system_names):
+        for token in set(normalize_name(sys_name).split()):
+            token_index[token].append(position)
+    return dict(token_index)
+
+def find_potential_matches(name: str, system_names: List[str], max_matches: int = 5,
+                           token_index: Optional[Dict[str, List[int]]] = None) -> List[Tuple[str, int]]:
+    if token_index is None:
+        token_index = build_token_index(system_names)
     name_words = set(normalize_name(name).split())
-    scores = []
-    for sys_name in system_names:
-        sys_words = set(normalize_name(sys_name).split())
-        common = name_words.intersection(sys_words)
-        if common:
-            scores.append((sys_name, len(common)))
-    scores.sort(key=lambda x: -x[1])
+    counts = Counter(position for word in name_words for position in token_index.get(word, ()))
+    # Most common words first, system order on ties
+    top = heapq.nlargest(15, counts.items(), key=lambda x: (x[1], -x[0]))
+    scores = [(system_names[position], count) for position, count in top]
     return scores[:15] if scores and scores[0][1] == 1 else scores[:max_matches]
 
-def interactive_matching(unmatched_children: List[Dict], system_names: List[str]) -> Dict[str, str]:
+def interactive_matching(unmatched_children: List[Dict], system_names: List[str],
+                         token_index: Optional[Dict[str, List[int]]] = None) -> Dict[str, str]:
+    if token_index is None:
+        token_index = build_token_index(system_names)
     matches = {}
     for idx, child in enumerate(unmatched_children):
         child_name = child['Child Name']
         chick = child.get('CHICK', '')
         clear_screen()
         print(f"Unmatched ({idx+1}/{len(unmatched_children)}): {child_name}  CHICK: {chick}")
-        options = find_potential_matches(child_name, system_names)
+        options = find_potential_matches(child_name, system_names, token_index=token_index)
         for i, (opt, _) in enumerate(options):
             print(f"{i+1}) {opt}")
         print("0) Skip")
@@ -94,53 +131,52 @@ def interactive_matching(unmatched_children: List[Dict], system_names: List[str]
             continue
     return matches
 
-def get_funding_blocks(df: pd.DataFrame, claim_until: str) -> Tuple[pd.DataFrame, str, str, Tuple[float, float]]:
-    df = df[["Allocation Description", "Allocation Date"]].dropna()
+def _coalesce_blocks(start_days: np.ndarray, end_days: np.ndarray, hours: np.ndarray,
+                     rates: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Merge back-to-back weeks (sorted by start) with equal hours and rate into blocks;
+    # returns each block's first start day, last end day, hours and rate
+    new_block = np.ones(len(start_days), dtype=bool)
+    new_block[1:] = (hours[1:] != hours[:-1]) | (rates[1:] != rates[:-1]) | (start_days[1:] != end_days[:-1] + 1)
+    first = np.flatnonzero(new_block)
+    last = np.append(first[1:] - 1, len(start_days) - 1)
+    return start_days[first], end_days[last], hours[first], rates[first]
+
+def get_funding_blocks(df: pd.DataFrame, subsidy_start: pd.Timestamp, subsidy_end: pd.Timestamp) -> Tuple[pd.DataFrame, str, str, Tuple[float, float]]:
+    df = df[["Allocation Description", "Allocation Date", "_hours", "_rate", "_end"]].dropna(subset=["Allocation Description", "Allocation Date"])
     if df.empty:
         return pd.DataFrame(), "", "", (0, 0)
 
-    def parse(row):
-        hours, rate = extract_hours_and_rate(row['Allocation Description'])
-        end = pd.to_datetime(row['Allocation Date'], dayfirst=True, errors='coerce')
-        if pd.isna(end):
-            return None
-        start = end - timedelta(days=6)
-        return pd.Series([hours, rate, start.date(), end.date()])
-
-    parsed = df.apply(parse, axis=1).dropna()
+    parsed = pd.DataFrame({
+        'Hours': df['_hours'],
+        'Rate': df['_rate'],
+        'Start': (df['_end'] - timedelta(days=6)).dt.normalize(),
+        'End': df['_end'].dt.normalize(),
+    }).dropna()
     if parsed.empty:
         return pd.DataFrame(), "", "", (0, 0)
 
-    parsed.columns = ['Hours', 'Rate', 'Start', 'End']
     parsed.sort_values('Start', inplace=True)
 
-    subsidy_end = datetime.strptime(claim_until, "%d/%m/%Y").date()
-    subsidy_start = subsidy_end - timedelta(weeks=52) + timedelta(days=1)
-
     parsed = parsed[(parsed['Start'] <= subsidy_end) & (parsed['End'] >= subsidy_start)]
     if parsed.empty:
         return pd.DataFrame(), "", "", (0, 0)
 
-    parsed['Start'] = parsed['Start'].apply(lambda d: max(d, subsidy_start))
-    parsed['End'] = parsed['End'].apply(lambda d: min(d, subsidy_end))
+    parsed['Start'] = parsed['Start'].clip(lower=subsidy_start)
+    parsed['End'] = parsed['End'].clip(upper=subsidy_end)
 
-    grouped = []
-    current = parsed.iloc[0].to_dict()
-
-    for i in range(1, len(parsed)):
-        row = parsed.iloc[i]
-        prev_end = current['End']
-        new_start = row['Start']
-        if row['Hours'] == current['Hours'] and row['Rate'] == current['Rate'] and new_start == prev_end + timedelta(days=1):
-            current['End'] = row['End']
-        else:
-            grouped.append(current)
-            current = row.to_dict()
-    grouped.append(current)
+    # Whole-day numbers, so that "back to back" is a plain integer comparison
+    start_days = parsed['Start'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    end_days = parsed['End'].to_numpy(dtype='datetime64[D]').astype(np.int64)
 
-    blocks = pd.DataFrame(grouped)
-    blocks['Start'] = pd.to_datetime(blocks['Start'])
-    blocks['End'] = pd.to_datetime(blocks['End'])
+    block_starts, block_ends, block_hours, block_rates = _coalesce_blocks(
+        start_days, end_days, parsed['Hours'].to_numpy(dtype=np.float64), parsed['Rate'].to_numpy(dtype=np.float64)
+    )
+    blocks = pd.DataFrame({
+        'Hours': block_hours,
+        'Rate': block_rates,
+        'Start': pd.to_datetime(block_starts.astype('datetime64[D]')),
+        'End': pd.to_datetime(block_ends.astype('datetime64[D]')),
+    })
 
     min_hours = blocks['Hours'].min()
     base_candidates = blocks[blocks['Hours'] == min_hours]
@@ -166,19 +202,32 @@ def main():
 
     clear_screen()
     print_status("Loading input files...")
-    children_df = pd.read_excel(args.children)
-    funding_df = pd.read_excel(args.funding)
-    system_df = pd.read_csv(args.system) if args.system.lower().endswith('.csv') else pd.read_excel(args.system)
+    # Only the columns this script uses are parsed
+    children_df = read_excel(args.children, usecols=lambda c: c in ('Child', 'CHICK', 'Date of Birth', 'Claim Until'))
+    funding_df = read_excel(args.funding, usecols=lambda c: c in ('Child', 'Allocation Description', 'Allocation Date'))
+    system_cols = lambda c: c == 'name'
+    system_df = pd.read_csv(args.system, usecols=system_cols) if args.system.lower().endswith('.csv') else read_excel(args.system, usecols=system_cols)
+
+    # Hours and rate for every allocation at once; rows without them drop out of the blocks
+    hours_rate = funding_df['Allocation Description'].astype('string').str.extract(_HOURS_RATE_RE)
+    funding_df['_hours'] = pd.to_numeric(hours_rate[0], errors='coerce')
+    funding_df['_rate'] = pd.to_numeric(hours_rate[1], errors='coerce')
+
+    # Allocation (week-ending) dates converted once for the whole table
+    funding_df['_end'] = pd.to_datetime(funding_df['Allocation Date'], dayfirst=True, errors='coerce')
 
     unmatched = []
     name_map = {}
-    result_rows = []
-    uploader_rows = []
+    # Uploader columns; every forAutoFiller row gets a matching uploader row
+    out_children, out_chicks, out_dobs, out_claims = [], [], [], []
 
     system_names = system_df['name'].dropna().tolist()
-    for name in children_df['Child']:
-        norm = normalize_name(name)
-        match = next((s for s in system_names if normalize_name(s) == norm), None)
+    # Built in reverse so that, as with a front-to-back scan, the first system name wins on duplicates
+    norm_to_system = {normalize_name(s): s for s in reversed(system_names)}
+    token_index = build_token_index(system_names)
+    child_norms = children_df['Child'].astype('string').str.lower().str.split().str.join(' ').fillna('')
+    for name, norm in zip(children_df['Child'], child_norms):
+        match = norm_to_system.get(norm)
         if match:
             name_map[name] = match
         else:
@@ -186,76 +235,86 @@ def main():
 
     if args.interactive and unmatched:
         unmatched_dicts = [{"Child Name": name, "CHICK": children_df.loc[children_df['Child'] == name, 'CHICK'].values[0]} for name in unmatched]
-        matched = interactive_matching(unmatched_dicts, system_names)
+        matched = interactive_matching(unmatched_dicts, system_names, token_index)
         name_map.update(matched)
         for original, corrected in matched.items():
             children_df.loc[children_df['Child'] == original, 'Child'] = corrected
 
-    for _, child in children_df.iterrows():
-        name = child['Child']
-        chick = child['CHICK']
-        dob = child['Date of Birth']
-        claim_until = child['Claim Until']
+    # Subsidy windows (52 weeks ending on Claim Until) for every child at once; unparseable dates give
+    # an empty (NaT) window, so those children simply have no blocks
+    children_df['_subsidy_end'] = pd.to_datetime(children_df['Claim Until'], format='%d/%m/%Y', errors='coerce')
+    children_df['_subsidy_start'] = children_df['_subsidy_end'] - timedelta(weeks=52) + timedelta(days=1)
 
-        child_funding = funding_df[funding_df['Child'] == name]
-        blocks, claim_start, claim_end, base = get_funding_blocks(child_funding, str(claim_until))
-        if blocks.empty:
-            continue
+    # Each child's allocations, partitioned in one pass
+    funding_groups = dict(tuple(funding_df.groupby('Child', sort=False)))
 
-        base_hours, base_rate = base
-        uploader_rows.append({'Child': name, 'CHICK': chick, 'Date of Birth': dob, 'Claim Until': claim_end})
-
-        note = f"Base hours: {int(base_hours)}"
-        if len(blocks['Hours'].unique()) > 2:
-            note += "; more than two types of weekly hours"
-        if len(blocks['Rate'].unique()) > 1:
-            note += "; different hourly rates in CHICK"
-
-        result_rows.append({
-            'Child': name,
-            'CHICK': chick,
-            'Date of Birth': dob,
-            'Claim Until': claim_end,
-            'Weekly Total': int(base_hours),
-            'Hour rate': f"€{base_rate:.2f}",
-            'Funding Start': claim_start,
-            'Note': note
-        })
-
-        for _, block in blocks.iterrows():
-            if float(block['Hours']) == base_hours:
-                continue
-            diff = int(block['Hours'] - base_hours)
-            if diff <= 0:
-                continue
+    # forAutoFiller.csv is streamed row by row as the blocks are worked out
+    os.makedirs(args.output_dir, exist_ok=True)
+    autofiller_path = os.path.join(args.output_dir, 'forAutoFiller.csv')
+    with open(autofiller_path, 'w', newline='', encoding='utf-8-sig') as autofiller_file:
+        autofiller = csv.writer(autofiller_file, lineterminator=os.linesep)
+        autofiller.writerow(['Child', 'CHICK', 'Date of Birth', 'Claim Until', 'Weekly Total', 'Hour rate', 'Funding Start', 'Note'])
 
-            uploader_rows.append({'Child': name, 'CHICK': chick, 'Date of Birth': dob, 'Claim Until': block['End']})
+        child_columns = ['Child', 'CHICK', 'Date of Birth', '_subsidy_start', '_subsidy_end']
+        child_rows = children_df[child_columns].itertuples(index=False, name=None)
+        for name, chick, dob, subsidy_start, subsidy_end in child_rows:
 
-            result_rows.append({
-                'Child': name,
-                'CHICK': chick,
-                'Date of Birth': dob,
-                'Claim Until': block['End'],
-                'Weekly Total': diff,
-                'Hour rate': f"€{block['Rate']:.2f}",
-                'Funding Start': block['Start'],
-                'Note': f"Top-up +{diff}h"
-            })
+            child_funding = funding_groups.get(name)
+            if child_funding is None:
+                continue
+            blocks, claim_start, claim_end, base = get_funding_blocks(child_funding, subsidy_start, subsidy_end)
+            if blocks.empty:
+                continue
 
-    os.makedirs(args.output_dir, exist_ok=True)
-    pd.DataFrame(uploader_rows).to_excel(os.path.join(args.output_dir, 'toChildPathsUploader.xlsx'), index=False)
-    pd.DataFrame(result_rows).to_csv(os.path.join(args.output_dir, 'forAutoFiller.csv'), index=False, encoding='utf-8-sig')
+            base_hours, base_rate = base
+            note = f"Base hours: {int(base_hours)}"
+            if len(blocks['Hours'].unique()) > 2:
+                note += "; more than two types of weekly hours"
+            if len(blocks['Rate'].unique()) > 1:
+                note += "; different hourly rates in CHICK"
+            name_cell, chick_cell, dob_cell = csv_cell(name), csv_cell(chick), csv_cell(dob)
+
+            out_children.append(name)
+            out_chicks.append(chick)
+            out_dobs.append(dob)
+            out_claims.append(claim_end)
+            autofiller.writerow([name_cell, chick_cell, dob_cell, claim_end, int(base_hours), f"€{base_rate:.2f}", claim_start, note])
+
+            for block_hours, block_rate, block_start, block_end in blocks[['Hours', 'Rate', 'Start', 'End']].itertuples(index=False, name=None):
+                if float(block_hours) == base_hours:
+                    continue
+                diff = int(block_hours - base_hours)
+                if diff <= 0:
+                    continue
+
+                out_children.append(name)
+                out_chicks.append(chick)
+                out_dobs.append(dob)
+                out_claims.append(block_end)
+                autofiller.writerow([name_cell, chick_cell, dob_cell, block_end, diff, f"€{block_rate:.2f}", block_start, f"Top-up +{diff}h"])
+
+    uploader_df = pd.DataFrame({
+        'Child': out_children, 'CHICK': out_chicks, 'Date of Birth': out_dobs, 'Claim Until': out_claims
+    }, copy=False)
+    uploader_path = os.path.join(args.output_dir, 'toChildPathsUploader.xlsx')
+    try:
+        uploader_df.to_excel(uploader_path, index=False, engine='xlsxwriter')
+    except ImportError:
+        uploader_df.to_excel(uploader_path, index=False)
 
     unmatched_final = [u for u in unmatched if u not in name_map]
     if unmatched_final:
-        unmatched_dicts = [{"Child Name": name, "CHICK": children_df.loc[children_df['Child'] == name, 'CHICK'].values[0]} for name in unmatched_final]
-        enriched = []
-        for entry in unmatched_dicts:
-            suggestions = find_potential_matches(entry['Child Name'], system_names)
-            for i in range(5):
-                entry[f"Potential Match {i+1}"] = suggestions[i][0] if i < len(suggestions) else ""
-            enriched.append(entry)
-        pd.DataFrame(enriched).to_csv(os.path.join(args.output_dir, 'unmatchedChildren.csv'), index=False)
+        fieldnames = ['Child Name', 'CHICK'] + [f"Potential Match {i+1}" for i in range(5)]
+        with open(os.path.join(args.output_dir, 'unmatchedChildren.csv'), 'w', newline='', encoding='utf-8') as unmatched_file:
+            unmatched_writer = csv.DictWriter(unmatched_file, fieldnames=fieldnames, lineterminator=os.linesep)
+            unmatched_writer.writeheader()
+            for name in unmatched_final:
+                chick = children_df.loc[children_df['Child'] == name, 'CHICK'].values[0]
+                entry = {"Child Name": csv_cell(name), "CHICK": csv_cell(chick)}
+                suggestions = find_potential_matches(name, system_names, token_index=token_index)
+                for i in range(5):
+                    entry[f"Potential Match {i+1}"] = suggestions[i][0] if i < len(suggestions) else ""
+                unmatched_writer.writerow(entry)
         print_status(f"Saved {len(unmatched_final)} unmatched children.", "warning")
 
     print_status("Done. Files saved to output folder.", "success")
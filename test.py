@@ -1,25 +1,25 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 
 def process_funding_periods(file_path: str, claim_until_str: str = "17/08/2025"):
     # Завантаження даних
-    df = pd.read_excel(file_path)
+    usecols = ["Allocation Description", "Allocation Date"]  # читаємо лише потрібні колонки
+    try:
+        df = pd.read_excel(file_path, usecols=usecols, engine="calamine")  # швидший читач, якщо встановлено python-calamine
+    except (ImportError, ValueError):
+        df = pd.read_excel(file_path, usecols=usecols)
     df = df[['Allocation Description', 'Allocation Date']].dropna()
 
-    # Обробка: витяг годин і конвертація дат
-    def parse_allocation(row):
-        hours = float(row['Allocation Description'].split(" ")[0])
-        sunday = datetime.strptime(row['Allocation Date'], "%d/%m/%Y")
-        monday = sunday - timedelta(days=6)
-        return pd.Series([hours, monday.date(), sunday.date()], index=["Hours", "StartDate", "EndDate"])
-
-    df_parsed = df.apply(parse_allocation, axis=1)
-    df_parsed.sort_values("StartDate", inplace=True)
-    df_parsed.reset_index(drop=True, inplace=True)
+    # Обробка: витяг годин і дат тижня (векторно, по колонках)
+    df["Hours"] = df["Allocation Description"].str.split(" ", n=1).str[0].astype(float)
+    df["EndDate"] = pd.to_datetime(df["Allocation Date"], format="%d/%m/%Y")
+    df["StartDate"] = df["EndDate"] - pd.Timedelta(days=6)
+    df_parsed = df[["Hours", "StartDate", "EndDate"]].sort_values("StartDate").reset_index(drop=True)
 
     # Межі CHICK
-    chick_end = datetime.strptime(claim_until_str, "%d/%m/%Y").date()
-    chick_start = chick_end - timedelta(weeks=52) + timedelta(days=1)
+    chick_end = pd.Timestamp(datetime.strptime(claim_until_str, "%d/%m/%Y"))
+    chick_start = chick_end - pd.Timedelta(weeks=52) + pd.Timedelta(days=1)
 
     # Фільтрація періодів
     df_filtered = df_parsed[
@@ -27,32 +27,24 @@ def process_funding_periods(file_path: str, claim_until_str: str = "17/08/2025")
     ].copy()
 
     # Обрізка по межах CHICK
-    df_filtered["StartDate"] = df_filtered["StartDate"].apply(lambda d: max(d, chick_start))
-    df_filtered["EndDate"] = df_filtered["EndDate"].apply(lambda d: min(d, chick_end))
-
-    # Групування підряд періодів з однаковими годинами
-    grouped = []
-    current_group = {
-        "Start Date": df_filtered.loc[0, "StartDate"].strftime("%d/%m/%Y"),
-        "End Date": df_filtered.loc[0, "EndDate"].strftime("%d/%m/%Y"),
-        "Weekly Hours": df_filtered.loc[0, "Hours"]
-    }
-
-    for i in range(1, len(df_filtered)):
-        row = df_filtered.loc[i]
-        prev_row = df_filtered.loc[i - 1]
-        if row["Hours"] == current_group["Weekly Hours"] and row["StartDate"] == prev_row["StartDate"] + timedelta(days=7):
-            current_group["End Date"] = row["EndDate"].strftime("%d/%m/%Y")
-        else:
-            grouped.append(current_group)
-            current_group = {
-                "Start Date": row["StartDate"].strftime("%d/%m/%Y"),
-                "End Date": row["EndDate"].strftime("%d/%m/%Y"),
-                "Weekly Hours": row["Hours"]
-            }
-    grouped.append(current_group)
-
-    result_df = pd.DataFrame(grouped)
+    df_filtered["StartDate"] = df_filtered["StartDate"].clip(lower=chick_start)
+    df_filtered["EndDate"] = df_filtered["EndDate"].clip(upper=chick_end)
+
+    # Групування підряд періодів з однаковими годинами (дати як цілі номери днів)
+    start_day = pd.Series(df_filtered["StartDate"].to_numpy(dtype="datetime64[D]").astype(np.int64), index=df_filtered.index)
+    new_group = (
+        (df_filtered["Hours"] != df_filtered["Hours"].shift())
+        | (start_day != start_day.shift() + 7)
+    )
+    grouped = df_filtered.groupby(new_group.cumsum(), sort=False).agg(
+        StartDate=("StartDate", "first"), EndDate=("EndDate", "last"), Hours=("Hours", "first")
+    )
+
+    result_df = pd.DataFrame({
+        "Start Date": grouped["StartDate"].dt.strftime("%d/%m/%Y"),
+        "End Date": grouped["EndDate"].dt.strftime("%d/%m/%Y"),
+        "Weekly Hours": grouped["Hours"]
+    }).reset_index(drop=True)
     return result_df
 
 # Приклад використання:
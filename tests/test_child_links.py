@@ -0,0 +1,61 @@
+"""Regression tests: the regex fast path must agree with the lxml tree parser."""
+
+import importlib.util
+import logging
+import os
+import unittest
+
+_SPEC = importlib.util.spec_from_file_location(
+    'child_id_extractor',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'childID-extractor.py')
+)
+child_id_extractor = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(child_id_extractor)
+logging.getLogger('child_extractor').setLevel(logging.CRITICAL)
+
+
+def _child(child_id, name, attrs=''):
+    return (f'<div class="row"><a{attrs} href="/child/{child_id}/overview">'
+            f'<div class="col-lg-8">{name}</div></a></div>')
+
+
+class FastPathMatchesTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.extractor = child_id_extractor.ChildInfoExtractor()
+
+    def assertMatchesTree(self, html_content):
+        fast = self.extractor._fast_parse_child_links(html_content)
+        if fast is not None:
+            self.assertEqual(fast, self.extractor._parse_child_links(html_content))
+        return fast
+
+    def test_plain_markup_uses_fast_path(self):
+        html_content = '<html><body>' + _child('1', 'One') + _child('2', 'Two') + '</body></html>'
+        self.assertEqual(self.assertMatchesTree(html_content), [('1', 'One'), ('2', 'Two')])
+
+    def test_anchor_inside_script(self):
+        html_content = ('<html><body><script>var s = \'' + _child('1', 'Scripted') + '\';</script>'
+                        + _child('2', 'Two') + '</body></html>')
+        self.assertMatchesTree(html_content)
+
+    def test_anchor_inside_comment(self):
+        html_content = '<html><body><!-- ' + _child('1', 'Old') + ' -->' + _child('2', 'Two') + '</body></html>'
+        self.assertMatchesTree(html_content)
+
+    def test_anchor_inside_template(self):
+        html_content = '<html><body><template>' + _child('1', 'Tpl') + '</template>' + _child('2', 'Two') + '</body></html>'
+        self.assertMatchesTree(html_content)
+
+    def test_anchor_inside_textarea(self):
+        html_content = '<html><body><textarea>' + _child('1', 'Typed') + '</textarea>' + _child('2', 'Two') + '</body></html>'
+        self.assertMatchesTree(html_content)
+
+    def test_data_href_is_not_href(self):
+        html_content = ('<html><body><a data-href="/child/1/o" href="/settings">'
+                        '<div class="col-lg-8">Not a child</div></a>' + _child('2', 'Two') + '</body></html>')
+        self.assertEqual(self.assertMatchesTree(html_content), [('2', 'Two')])
+
+
+if __name__ == '__main__':
+    unittest.main()